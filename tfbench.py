@@ -7,6 +7,7 @@ A tool to run and visualize tframetest benchmarks with rich TUI components.
 
 import argparse
 import csv
+import io
 import os
 import platform
 import re
@@ -18,14 +19,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
-from rich.layout import Layout
-from rich.live import Live
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.text import Text
-from rich.bar import Bar
 
 
 @dataclass
@@ -47,33 +45,33 @@ class BenchmarkResult:
 class TframetestParser:
     """Parse tframetest output into structured data"""
 
-    PROFILE_PATTERN = r'Profile:\s*(.+)'
-    RESULTS_PATTERN = r'Results\s+(write|read):'
-    FRAMES_PATTERN = r'frames:\s*(\d+)'
-    BYTES_PATTERN = r'bytes\s*:\s*(\d+)'
-    TIME_PATTERN = r'time\s*:\s*(\d+)'
-    FPS_PATTERN = r'fps\s*:\s*([\d.]+)'
-    BPS_PATTERN = r'B/s\s*:\s*([\d.]+)'
-    MIBPS_PATTERN = r'MiB/s\s*:\s*([\d.]+)'
-    MIN_PATTERN = r'min\s*:\s*([\d.]+)\s*ms'
-    AVG_PATTERN = r'avg\s*:\s*([\d.]+)\s*ms'
-    MAX_PATTERN = r'max\s*:\s*([\d.]+)\s*ms'
+    PROFILE_PATTERN = re.compile(r'Profile:\s*(.+)')
+    RESULTS_PATTERN = re.compile(r'Results\s+(write|read):')
+    FRAMES_PATTERN = re.compile(r'frames:\s*(\d+)')
+    BYTES_PATTERN = re.compile(r'bytes\s*:\s*(\d+)')
+    TIME_PATTERN = re.compile(r'time\s*:\s*(\d+)')
+    FPS_PATTERN = re.compile(r'fps\s*:\s*([\d.]+)')
+    BPS_PATTERN = re.compile(r'B/s\s*:\s*([\d.]+)')
+    MIBPS_PATTERN = re.compile(r'MiB/s\s*:\s*([\d.]+)')
+    MIN_PATTERN = re.compile(r'min\s*:\s*([\d.]+)\s*ms')
+    AVG_PATTERN = re.compile(r'avg\s*:\s*([\d.]+)\s*ms')
+    MAX_PATTERN = re.compile(r'max\s*:\s*([\d.]+)\s*ms')
 
     @classmethod
     def parse(cls, output: str) -> Optional[BenchmarkResult]:
         """Parse tframetest output text into BenchmarkResult"""
         try:
-            profile = re.search(cls.PROFILE_PATTERN, output)
-            results = re.search(cls.RESULTS_PATTERN, output)
-            frames = re.search(cls.FRAMES_PATTERN, output)
-            bytes_match = re.search(cls.BYTES_PATTERN, output)
-            time_match = re.search(cls.TIME_PATTERN, output)
-            fps = re.search(cls.FPS_PATTERN, output)
-            bps = re.search(cls.BPS_PATTERN, output)
-            mibps = re.search(cls.MIBPS_PATTERN, output)
-            min_time = re.search(cls.MIN_PATTERN, output)
-            avg_time = re.search(cls.AVG_PATTERN, output)
-            max_time = re.search(cls.MAX_PATTERN, output)
+            profile = cls.PROFILE_PATTERN.search(output)
+            results = cls.RESULTS_PATTERN.search(output)
+            frames = cls.FRAMES_PATTERN.search(output)
+            bytes_match = cls.BYTES_PATTERN.search(output)
+            time_match = cls.TIME_PATTERN.search(output)
+            fps = cls.FPS_PATTERN.search(output)
+            bps = cls.BPS_PATTERN.search(output)
+            mibps = cls.MIBPS_PATTERN.search(output)
+            min_time = cls.MIN_PATTERN.search(output)
+            avg_time = cls.AVG_PATTERN.search(output)
+            max_time = cls.MAX_PATTERN.search(output)
 
             if not all([profile, results, frames, bytes_match, time_match,
                        fps, bps, mibps, min_time, avg_time, max_time]):
@@ -135,7 +133,7 @@ class BenchmarkRunner:
 
         # Check for local binary
         local_binary = script_dir / "tframetest"
-        if local_binary.exists() and local_binary.is_file():
+        if local_binary.is_file():
             return str(local_binary)
 
         # Fall back to PATH
@@ -275,9 +273,25 @@ class BenchmarkRunner:
 class BenchmarkVisualizer:
     """Create Rich TUI visualizations for benchmark results"""
 
+    # Bar colors for the throughput chart: write first, then reads in order
+    THROUGHPUT_COLORS = ("green", "blue", "cyan", "magenta", "yellow")
+
     def __init__(self, console: Console):
         self.console = console
 
+    @staticmethod
+    def _read_numbers(results: list[BenchmarkResult]) -> list[int]:
+        """Return the 1-based read index of each result (0 for writes)"""
+        read_numbers = []
+        read_num = 0
+        for result in results:
+            if result.operation == "read":
+                read_num += 1
+                read_numbers.append(read_num)
+            else:
+                read_numbers.append(0)
+        return read_numbers
+
     def create_throughput_chart(self, results: list[BenchmarkResult]) -> Panel:
         """Create bar chart comparing throughput across tests"""
         table = Table.grid(padding=(0, 2))
@@ -289,17 +303,14 @@ class BenchmarkVisualizer:
         # Find max for scaling
         max_mib = max(r.mib_per_sec for r in results)
 
-        colors = ["green", "blue", "cyan", "magenta", "yellow"]
-
-        for i, result in enumerate(results):
+        for result, read_num in zip(results, self._read_numbers(results)):
             # Determine label
             if result.operation == "write":
                 label = "Write"
-                color = colors[0]
+                color = self.THROUGHPUT_COLORS[0]
             else:
-                read_num = sum(1 for r in results[:i+1] if r.operation == "read")
                 label = f"Read #{read_num}"
-                color = colors[min(read_num, len(colors)-1)]
+                color = self.THROUGHPUT_COLORS[min(read_num, len(self.THROUGHPUT_COLORS)-1)]
 
                 # Add cache indicator
                 if read_num == 1:
@@ -332,12 +343,11 @@ class BenchmarkVisualizer:
         table.add_column("Max (ms)", justify="right")
         table.add_column("Range (ms)", justify="right")
 
-        for i, result in enumerate(results):
+        for result, read_num in zip(results, self._read_numbers(results)):
             # Determine label
             if result.operation == "write":
                 label = "Write"
             else:
-                read_num = sum(1 for r in results[:i+1] if r.operation == "read")
                 label = f"Read #{read_num}"
 
             # Calculate range
@@ -423,13 +433,12 @@ class BenchmarkVisualizer:
         table.add_column("MiB/s", justify="right")
         table.add_column("Time (s)", justify="right")
 
-        for i, result in enumerate(results):
+        for result, read_num in zip(results, self._read_numbers(results)):
             # Determine label
             if result.operation == "write":
                 label = "Write"
                 style = "green"
             else:
-                read_num = sum(1 for r in results[:i+1] if r.operation == "read")
                 label = f"Read #{read_num}"
                 style = "cyan" if read_num == 2 else "blue"
 
@@ -456,8 +465,8 @@ class BenchmarkVisualizer:
         if len(set(frame_counts)) > 1:
             self.console.print()
             self.console.print("[bold yellow]⚠ Warning:[/bold yellow] Tests completed different frame counts:")
-            for i, result in enumerate(results):
-                op_label = "Write" if result.operation == "write" else f"Read #{sum(1 for r in results[:i+1] if r.operation == 'read')}"
+            for result, read_num in zip(results, self._read_numbers(results)):
+                op_label = "Write" if result.operation == "write" else f"Read #{read_num}"
                 self.console.print(f"  {op_label}: {result.frames:,} frames")
             self.console.print()
 
@@ -483,94 +492,101 @@ class BenchmarkVisualizer:
         self.console.print(Panel(summary, border_style="blue"))
         self.console.print()
 
-        # Main visualizations
-        self.console.print(self.create_throughput_chart(results))
-        self.console.print()
-        self.console.print(self.create_insights_panel(results))
-        self.console.print()
-        self.console.print(self.create_latency_chart(results))
-        self.console.print()
-        self.console.print(self.create_detailed_table(results))
-        self.console.print()
+        # Main visualizations, rendered as one group so Rich lays out and
+        # writes them in a single pass
+        self.console.print(Group(
+            self.create_throughput_chart(results),
+            Text(),
+            self.create_insights_panel(results),
+            Text(),
+            self.create_latency_chart(results),
+            Text(),
+            self.create_detailed_table(results),
+            Text(),
+        ))
 
     def export_csv(self, results: list[BenchmarkResult], csv_path: str,
                    target_dir: str, write_size: str, threads: int) -> bool:
         """Export benchmark results to CSV file"""
         try:
-            with open(csv_path, 'w', newline='') as csvfile:
-                # Write metadata header
-                writer = csv.writer(csvfile)
-                writer.writerow(['# Benchmark Metadata'])
-                writer.writerow(['timestamp', datetime.now().isoformat()])
-                writer.writerow(['target_directory', target_dir])
-                writer.writerow(['frame_size', write_size])
-                writer.writerow(['threads', threads])
-                writer.writerow([])
+            # Build the whole report in memory so a failure part-way through
+            # doesn't leave a truncated CSV behind
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            # Write metadata header
+            writer.writerow(['# Benchmark Metadata'])
+            writer.writerow(['timestamp', datetime.now().isoformat()])
+            writer.writerow(['target_directory', target_dir])
+            writer.writerow(['frame_size', write_size])
+            writer.writerow(['threads', threads])
+            writer.writerow([])
+
+            # Write results header
+            writer.writerow(['# Benchmark Results'])
+            writer.writerow([
+                'test_name',
+                'operation',
+                'profile',
+                'frames',
+                'bytes',
+                'time_ns',
+                'time_seconds',
+                'fps',
+                'bytes_per_sec',
+                'mib_per_sec',
+                'min_ms',
+                'avg_ms',
+                'max_ms',
+                'range_ms'
+            ])
+
+            # Write results data
+            for result, read_num in zip(results, self._read_numbers(results)):
+                if result.operation == "write":
+                    test_name = "Write"
+                else:
+                    test_name = f"Read_{read_num}"
+
+                range_ms = result.max_ms - result.min_ms
 
-                # Write results header
-                writer.writerow(['# Benchmark Results'])
                 writer.writerow([
-                    'test_name',
-                    'operation',
-                    'profile',
-                    'frames',
-                    'bytes',
-                    'time_ns',
-                    'time_seconds',
-                    'fps',
-                    'bytes_per_sec',
-                    'mib_per_sec',
-                    'min_ms',
-                    'avg_ms',
-                    'max_ms',
-                    'range_ms'
+                    test_name,
+                    result.operation,
+                    result.profile,
+                    result.frames,
+                    result.bytes,
+                    result.time_ns,
+                    result.time_ns / 1e9,
+                    result.fps,
+                    result.bytes_per_sec,
+                    result.mib_per_sec,
+                    result.min_ms,
+                    result.avg_ms,
+                    result.max_ms,
+                    range_ms
                 ])
 
-                # Write results data
-                for i, result in enumerate(results):
-                    if result.operation == "write":
-                        test_name = "Write"
-                    else:
-                        read_num = sum(1 for r in results[:i+1] if r.operation == "read")
-                        test_name = f"Read_{read_num}"
-
-                    range_ms = result.max_ms - result.min_ms
-
-                    writer.writerow([
-                        test_name,
-                        result.operation,
-                        result.profile,
-                        result.frames,
-                        result.bytes,
-                        result.time_ns,
-                        result.time_ns / 1e9,
-                        result.fps,
-                        result.bytes_per_sec,
-                        result.mib_per_sec,
-                        result.min_ms,
-                        result.avg_ms,
-                        result.max_ms,
-                        range_ms
-                    ])
-
-                # Write calculated insights if available
-                write_result = next((r for r in results if r.operation == "write"), None)
-                read_results = [r for r in results if r.operation == "read"]
-
-                if write_result and len(read_results) >= 2:
-                    writer.writerow([])
-                    writer.writerow(['# Performance Insights'])
-                    writer.writerow(['metric', 'value'])
-
-                    cache_speedup = read_results[1].mib_per_sec / read_results[0].mib_per_sec
-                    writer.writerow(['cache_speedup_ratio', f"{cache_speedup:.4f}"])
+            # Write calculated insights if available
+            write_result = next((r for r in results if r.operation == "write"), None)
+            read_results = [r for r in results if r.operation == "read"]
 
-                    best_read = max(read_results, key=lambda r: r.mib_per_sec)
-                    read_write_ratio = best_read.mib_per_sec / write_result.mib_per_sec
-                    writer.writerow(['read_write_ratio', f"{read_write_ratio:.4f}"])
+            if write_result and len(read_results) >= 2:
+                writer.writerow([])
+                writer.writerow(['# Performance Insights'])
+                writer.writerow(['metric', 'value'])
+
+                cache_speedup = read_results[1].mib_per_sec / read_results[0].mib_per_sec
+                writer.writerow(['cache_speedup_ratio', f"{cache_speedup:.4f}"])
+
+                best_read = max(read_results, key=lambda r: r.mib_per_sec)
+                read_write_ratio = best_read.mib_per_sec / write_result.mib_per_sec
+                writer.writerow(['read_write_ratio', f"{read_write_ratio:.4f}"])
+
+                latency_improvement = (read_results[0].avg_ms - read_results[1].avg_ms) / read_results[0].avg_ms * 100
+                writer.writerow(['latency_improvement_percent', f"{latency_improvement:.2f}"])
 
-                    latency_improvement = (read_results[0].avg_ms - read_results[1].avg_ms) / read_results[0].avg_ms * 100
-                    writer.writerow(['latency_improvement_percent', f"{latency_improvement:.2f}"])
+            Path(csv_path).write_text(buffer.getvalue(), newline='')
 
             return True
         except Exception as e: